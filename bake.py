@@ -1,18 +1,40 @@
 #!/usr/bin/env python3
+from __future__ import annotations
+
 import argparse
+import json
 import os
-import shutil
+import re
+import shlex
+import stat
+import subprocess
 import sys
-
-import rich.box
-from rich.table import Table
+import tempfile
+from typing import TYPE_CHECKING
 
 import constants
-from printer import CustomPrinter
 
+if TYPE_CHECKING:
+    from printer import CustomPrinter
 
-def create_parser() -> argparse.ArgumentParser:
-    # Create the main parser
+# Matches the (backslash-escaped) target script path embedded by create_wrapper_script,
+# tolerating the spacing changes a hand edit might introduce
+SCRIPT_PATH_RE = re.compile(rb'\s*script_path\s*=\s*"((?:[^"\\]|\\.)+)"')
+ESCAPE_RE = re.compile(rb'\\(.)')
+# Index entry for wrappers whose script path can't be parsed (e.g. after a hand edit)
+UNKNOWN_SCRIPT_PATH = "?"
+
+# Command names become file names in the wrapper and bin directories
+COMMAND_NAME_RE = re.compile(r'^[a-zA-Z][a-zA-Z0-9_-]*\Z')
+RESERVED_NAMES = frozenset({"bake"})
+
+# Lines that set PATH in a bash/zsh ("export PATH=...") or fish ("set -gx PATH ...", "fish_add_path ...") config
+PATH_ASSIGNMENT_RE = re.compile(r'\s*(?:(?:export\s+)?PATH=|set\s+(?:-\w+\s+)*PATH\s|fish_add_path\s)(.*)')
+PATH_SEPARATOR_RE = re.compile(r'[:\s"\']+')
+
+
+def create_install_parser() -> argparse.ArgumentParser:
+    """Create a parser with only the installation/management flags"""
     parser = argparse.ArgumentParser(description="Bake: A tool for managing custom commands")
 
     # Group common installation/management flags
@@ -25,6 +47,13 @@ def create_parser() -> argparse.ArgumentParser:
     management_group.add_argument("-f", "--force", action="store_true", help="Skip confirmation prompts.")
     management_group.add_argument("-v", "--version", action="store_true", help="Outputs the current version number")
 
+    return parser
+
+
+def create_parser() -> argparse.ArgumentParser:
+    # Create the main parser
+    parser = create_install_parser()
+
     # Create subparsers
     subparsers = parser.add_subparsers(dest="action", help="The action to perform")
 
@@ -36,7 +65,7 @@ def create_parser() -> argparse.ArgumentParser:
     subparsers.add_parser("list", help="List all installed commands")
 
     add_parser = subparsers.add_parser("add", help="Add a new command", parents=[name_parser])
-    add_parser.add_argument("script_path", type=argparse.FileType(), help="Path to the Python script")
+    add_parser.add_argument("script_path", help="Path to the Python script")
 
     subparsers.add_parser("edit", help="Edit an existing command", parents=[name_parser])
     subparsers.add_parser("delete", help="Delete an existing command", parents=[name_parser])
@@ -49,12 +78,11 @@ def create_parser() -> argparse.ArgumentParser:
     return parser
 
 
-def create_wrapper_script(script_path: str) -> str:
-    return f'''#!/usr/bin/env python3
+WRAPPER_TEMPLATE = '''#!/usr/bin/env python3
 import sys
 import os
 
-script_path = "{script_path}"
+script_path = "__SCRIPT_PATH__"
 
 if __name__ == "__main__":
     args = sys.argv[1:]
@@ -62,96 +90,268 @@ if __name__ == "__main__":
 '''
 
 
+def create_wrapper_script(script_path: str) -> str:
+    # Escape the path so quotes and backslashes survive inside the string literal
+    escaped = script_path.replace('\\', '\\\\').replace('"', '\\"')
+    return WRAPPER_TEMPLATE.replace("__SCRIPT_PATH__", escaped)
+
+
+def command_paths(name: str) -> tuple[str, str]:
+    """Return the wrapper script and alias symlink paths for a command"""
+    return constants.WRAPPER_PREFIX + name, constants.BIN_PREFIX + name
+
+
+def remove_if_exists(path: str, dir_fd: int | None = None) -> bool:
+    """Remove a file or symlink (without following it), returning whether it existed"""
+    try:
+        os.unlink(path, dir_fd=dir_fd)
+        return True
+    except FileNotFoundError:
+        return False
+
+
+def write_wrapper_script(wrapper_path: str, script_path: str) -> None:
+    """Atomically write an executable wrapper script pointing at script_path"""
+    wrapper_dir, name = os.path.split(wrapper_path)
+    while True:
+        # Command names can't start with ".", so a dot-prefixed temp file never collides with one
+        tmp_path = os.path.join(wrapper_dir, f".{name}.{os.urandom(4).hex()}")
+        try:
+            # Created executable up front, so no separate chmod is needed
+            fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL | os.O_CLOEXEC, 0o755)
+            break
+        except FileExistsError:
+            continue
+    try:
+        os.write(fd, create_wrapper_script(script_path).encode())
+    except BaseException:
+        os.close(fd)
+        os.remove(tmp_path)
+        raise
+    os.close(fd)
+    os.replace(tmp_path, wrapper_path)
+
+
+def read_script_path(wrapper_path: str) -> str:
+    """Extract the target script path embedded in a wrapper script"""
+    # The path is assigned near the top of the wrapper, so stop at the first matching line.
+    # Lines are scanned as raw bytes so only the matched path gets decoded.
+    with open(wrapper_path, 'rb') as f:
+        for line in f:
+            match = SCRIPT_PATH_RE.match(line)
+            if match:
+                return os.fsdecode(ESCAPE_RE.sub(rb'\1', match.group(1)))
+
+    raise ValueError(f"No script path found in {wrapper_path}")
+
+
+def build_command_index() -> dict:
+    """Rebuild the command index by scanning the wrapper scripts"""
+    index = {}
+    with os.scandir(constants.WRAPPER_SCRIPTS_FOLDER) as entries:
+        for entry in entries:
+            # d_type from the directory listing answers is_file without another stat;
+            # dot-entries are temp files left over from an interrupted write
+            if entry.name.startswith(".") or not entry.is_file(follow_symlinks=False):
+                continue
+            try:
+                index[entry.name] = read_script_path(entry.path)
+            except ValueError:
+                # One hand-edited wrapper shouldn't make every other command unusable
+                index[entry.name] = UNKNOWN_SCRIPT_PATH
+    return index
+
+
+def load_command_index() -> dict:
+    """Load the command index, rebuilding it from the wrapper scripts if it is missing"""
+    try:
+        with open(constants.COMMAND_INDEX, 'r') as f:
+            return json.load(f)
+    except (FileNotFoundError, ValueError):
+        index = build_command_index()
+        save_command_index(index)
+        return index
+
+
+def lookup_script_path(name: str, wrapper_path: str | None = None) -> str:
+    """Look up a command's target script, falling back to its wrapper if the index lacks it.
+
+    Lookups only feed messages and index entries, so failures give UNKNOWN_SCRIPT_PATH instead of raising.
+    """
+    try:
+        script_path = load_command_index().get(name)
+        if script_path is None:
+            script_path = read_script_path(wrapper_path or command_paths(name)[0])
+        return script_path
+    except (OSError, ValueError):
+        return UNKNOWN_SCRIPT_PATH
+
+
+def update_command_index(printer: CustomPrinter, updates: dict) -> None:
+    """Apply name -> script path updates to the command index, removing names mapped to None.
+
+    This runs after the wrappers have already changed, so an index problem is only warned about.
+    """
+    try:
+        index = load_command_index()
+        for name, script_path in updates.items():
+            if script_path is None:
+                index.pop(name, None)
+            else:
+                index[name] = script_path
+        save_command_index(index)
+    except OSError as e:
+        printer.warn(f"Could not update the command index: {e}")
+
+
+def save_command_index(index: dict) -> None:
+    """Atomically write the command index"""
+    with tempfile.NamedTemporaryFile('w', dir=os.path.dirname(constants.COMMAND_INDEX), suffix='.tmp',
+                                     delete=False) as f:
+        json.dump(index, f, indent=2, sort_keys=True)
+    os.replace(f.name, constants.COMMAND_INDEX)
+
+
+def validate_command_name(name: str) -> str | None:
+    """Return why a command name can't be used, or None if it is valid"""
+    if name.lower() in RESERVED_NAMES:
+        return f'"{name}" would conflict with the main script.'
+    if COMMAND_NAME_RE.match(name) is None:
+        return (f'"{name}" is not a valid command name. Use letters, digits, "_" and "-", '
+                f'starting with a letter.')
+    return None
+
+
+def validate_script_path(script_path: str) -> str | None:
+    """Return why a script can't be baked, or None if it is a readable file"""
+    try:
+        st = os.stat(script_path)
+    except FileNotFoundError:
+        return f"Script not found: {script_path}"
+    except OSError as e:
+        # e.g. a path component that isn't a directory, a search permission error or a name that's too long
+        return f"Cannot access script: {script_path} ({e.strerror})"
+    if not stat.S_ISREG(st.st_mode):
+        return f"Not a file: {script_path}"
+    # os.access still has the final say, since it accounts for ACLs and the effective user
+    if not os.access(script_path, os.R_OK):
+        return f"Script is not readable: {script_path}"
+    return None
+
+
+def puts_on_path(line: str, directory: str) -> bool:
+    """Whether a shell config line adds directory to PATH as a whole component"""
+    match = PATH_ASSIGNMENT_RE.match(line)
+    if match is None:
+        return False
+    for component in PATH_SEPARATOR_RE.split(match.group(1)):
+        if component.startswith("~/"):
+            component = "$HOME" + component[1:]
+        component = component.replace("${HOME}", "$HOME", 1).replace("$HOME", constants.HOME, 1)
+        if component.rstrip("/") == directory:
+            return True
+    return False
+
+
 def ensure_bin_in_path() -> None:
     """Ensure user's local bin directory is in PATH"""
-    bin_dir = os.path.dirname(constants.INSTALL_LINK)
-    if not os.path.exists(bin_dir):
-        os.makedirs(bin_dir, exist_ok=True)
+    bin_dir = constants.USER_BIN_DIR
+    os.makedirs(bin_dir, exist_ok=True)
 
     # Add to PATH in shell config if not already there
     shell_config = constants.get_shell_config_file()
     if shell_config:
-        with open(shell_config, 'r') as f:
-            content = f.read()
-
         path_line = f'export PATH="$PATH:{bin_dir}"'
-        if path_line not in content:
-            with open(shell_config, 'a') as f:
+
+        # Scan and append through the same handle; writes in append mode always land at the end.
+        # Stop at the first line that already puts the bin directory on PATH.
+        with open(shell_config, 'a+') as f:
+            f.seek(0)
+            added = not any(puts_on_path(line, bin_dir) for line in f)
+            if added:
                 f.write(f'\n{path_line}\n')
+
+        if added:
             print(f"Added {bin_dir} to PATH in {shell_config}")
             print("Please restart your terminal or run:")
             print(f"    source {shell_config}")
 
 
 def add_command(args: argparse.Namespace, printer: CustomPrinter) -> None:
-    # Prevent creating a command named "bake"
-    if args.name.lower() == "bake":
-        printer.error('Cannot create a command named "bake" as it would conflict with the main script.')
+    # Prevent creating a command named "bake" or one that isn't a plain file name
+    reason = validate_command_name(args.name)
+    if reason:
+        printer.error(f"Cannot create command: {reason}")
         return
 
-    script_path = os.path.abspath(args.script_path.name)
-    if not os.path.exists(script_path):
-        printer.error(f"Script not found: {script_path}")
+    script_path = os.path.abspath(args.script_path)
+    reason = validate_script_path(script_path)
+    if reason:
+        printer.error(reason)
         return
 
-    wrapper_path = os.path.join(constants.WRAPPER_SCRIPTS_FOLDER, args.name)
-    symlink_path = os.path.join(constants.USER_BIN_DIR, args.name)
+    wrapper_path, symlink_path = command_paths(args.name)
 
     # Check if command already exists and confirm overwrite
     if (os.path.exists(wrapper_path) or os.path.exists(symlink_path)) and not args.force:
         printer.warn(f"Command '{args.name}' already exists!")
         if os.path.exists(wrapper_path):
-            with open(wrapper_path, 'r') as f:
-                content = f.read()
-                current_script = content.split('script_path = "')[1].split('"')[0]
-                printer.info(f"Current script: {current_script}")
-                printer.info(f"New script: {script_path}")
-
-        confirm = printer.input("\nDo you want to overwrite it? [y/N]: ").lower()
-        if confirm != 'y':
+            printer.info(f"Current script: {lookup_script_path(args.name)}")
+            printer.info(f"New script: {script_path}")
+
+        if not printer.confirm("Do you want to overwrite it?"):
             printer.info("Command creation cancelled.")
             return
 
-    # Create wrapper script
-    with open(wrapper_path, 'w') as f:
-        f.write(create_wrapper_script(script_path))
-
-    # Make executable
-    os.chmod(wrapper_path, 0o755)
+    # Create executable wrapper script
+    write_wrapper_script(wrapper_path, script_path)
 
     # Create symlink
-    if os.path.exists(symlink_path):
-        os.remove(symlink_path)
+    remove_if_exists(symlink_path)
     os.symlink(wrapper_path, symlink_path)
 
+    # Record the command in the index
+    update_command_index(printer, {args.name: script_path})
+
     printer.success(f"Added command '{args.name}' pointing to {script_path}")
 
 
 def edit_command(args: argparse.Namespace, printer: CustomPrinter) -> None:
-    wrapper_path = os.path.join(constants.WRAPPER_SCRIPTS_FOLDER, args.name)
+    wrapper_path, _ = command_paths(args.name)
     if not os.path.exists(wrapper_path):
         printer.error(f"Command not found: {args.name}")
         return
 
     editor = os.environ.get('EDITOR', 'nano')
-    os.system(f"{editor} {wrapper_path}")
+    subprocess.run(shlex.split(editor) + [wrapper_path], check=False)
+
+    # The target script may have changed during the edit
+    try:
+        script_path = read_script_path(wrapper_path)
+    except ValueError:
+        # The edit itself went through; only the listed script location may now be stale
+        printer.warn(f"Could not read the script path from '{args.name}', keeping its previous index entry")
+    else:
+        update_command_index(printer, {args.name: script_path})
+
     printer.success(f"Edited command '{args.name}'")
 
 
 def delete_command(args: argparse.Namespace, printer: CustomPrinter) -> None:
-    wrapper_path = os.path.join(constants.WRAPPER_SCRIPTS_FOLDER, args.name)
-    symlink_path = os.path.join(constants.USER_BIN_DIR, args.name)
+    wrapper_path, symlink_path = command_paths(args.name)
 
     if not os.path.exists(wrapper_path):
         printer.error(f"Command not found: {args.name}")
         return
 
     # Remove symlink first
-    if os.path.exists(symlink_path):
-        os.remove(symlink_path)
+    remove_if_exists(symlink_path)
 
     # Remove wrapper script
     os.remove(wrapper_path)
+
+    update_command_index(printer, {args.name: None})
+
     printer.success(f"Deleted command '{args.name}'")
 
 
@@ -160,9 +360,10 @@ def rename_command(args: argparse.Namespace, printer: CustomPrinter) -> None:
     old_name = args.old_name
     new_name = args.new_name
     
-    # Prevent renaming to "bake"
-    if new_name.lower() == "bake":
-        printer.error('Cannot rename command to "bake" as it would conflict with the main script.')
+    # Prevent renaming to "bake" or to a name that isn't a plain file name
+    reason = validate_command_name(new_name)
+    if reason:
+        printer.error(f"Cannot rename command: {reason}")
         return
     
     # Prevent renaming to the same name
@@ -170,10 +371,8 @@ def rename_command(args: argparse.Namespace, printer: CustomPrinter) -> None:
         printer.error("Old name and new name are the same.")
         return
     
-    old_wrapper_path = os.path.join(constants.WRAPPER_SCRIPTS_FOLDER, old_name)
-    old_symlink_path = os.path.join(constants.USER_BIN_DIR, old_name)
-    new_wrapper_path = os.path.join(constants.WRAPPER_SCRIPTS_FOLDER, new_name)
-    new_symlink_path = os.path.join(constants.USER_BIN_DIR, new_name)
+    old_wrapper_path, old_symlink_path = command_paths(old_name)
+    new_wrapper_path, new_symlink_path = command_paths(new_name)
     
     # Check if old command exists
     if not os.path.exists(old_wrapper_path):
@@ -184,59 +383,49 @@ def rename_command(args: argparse.Namespace, printer: CustomPrinter) -> None:
     if (os.path.exists(new_wrapper_path) or os.path.exists(new_symlink_path)) and not args.force:
         printer.warn(f"Command '{new_name}' already exists!")
         if os.path.exists(new_wrapper_path):
-            with open(new_wrapper_path, 'r') as f:
-                content = f.read()
-                current_script = content.split('script_path = "')[1].split('"')[0]
-                printer.info(f"Current script: {current_script}")
+            printer.info(f"Current script: {lookup_script_path(new_name)}")
         
-        confirm = printer.input("\nDo you want to overwrite it? [y/N]: ").lower()
-        if confirm != 'y':
+        if not printer.confirm("Do you want to overwrite it?"):
             printer.info("Command rename cancelled.")
             return
     
+    # The wrapper only embeds the target script path, so it can be moved as-is
     try:
-        # Read the current wrapper script to get the target script path
-        with open(old_wrapper_path, 'r') as f:
-            content = f.read()
-            script_path = content.split('script_path = "')[1].split('"')[0]
-        
-        # Create new wrapper script with the new name
-        with open(new_wrapper_path, 'w') as f:
-            f.write(create_wrapper_script(script_path))
-        
-        # Make new wrapper script executable
-        os.chmod(new_wrapper_path, 0o755)
+        os.rename(old_wrapper_path, new_wrapper_path)
         
         # Create new symlink
-        if os.path.exists(new_symlink_path):
-            os.remove(new_symlink_path)
+        remove_if_exists(new_symlink_path)
         os.symlink(new_wrapper_path, new_symlink_path)
         
         # Remove old symlink
-        if os.path.exists(old_symlink_path):
-            os.remove(old_symlink_path)
-        
-        # Remove old wrapper script
-        os.remove(old_wrapper_path)
-        
-        printer.success(f"Renamed command '{old_name}' to '{new_name}'")
-        
+        remove_if_exists(old_symlink_path)
+
     except Exception as e:
         printer.error(f"Failed to rename command: {str(e)}")
-        # Clean up if something went wrong
-        if os.path.exists(new_wrapper_path):
-            os.remove(new_wrapper_path)
-        if os.path.exists(new_symlink_path):
-            os.remove(new_symlink_path)
+        # Move the wrapper back if something went wrong
+        if os.path.exists(new_wrapper_path) and not os.path.exists(old_wrapper_path):
+            os.rename(new_wrapper_path, old_wrapper_path)
+        remove_if_exists(new_symlink_path)
+        return
+
+    # Move the index entry over to the new name; the old name's wrapper now lives at the new path
+    script_path = lookup_script_path(old_name, new_wrapper_path)
+    update_command_index(printer, {old_name: None, new_name: script_path})
+
+    printer.success(f"Renamed command '{old_name}' to '{new_name}'")
 
 
-def list_commands(printer: CustomPrinter) -> None:
+def list_commands(args: argparse.Namespace, printer: CustomPrinter) -> None:
     """List all installed commands with their target scripts"""
+    # Rich tables are only needed here, so keep them off the startup path of other actions
+    import rich.box
+    from rich.table import Table
+
     if not os.path.exists(constants.WRAPPER_SCRIPTS_FOLDER):
         printer.warn("Wrapper scripts folder missing.")
         return
 
-    commands = os.listdir(constants.WRAPPER_SCRIPTS_FOLDER)
+    commands = load_command_index()
     if not commands:
         printer.info("No commands baked yet.")
         return
@@ -247,23 +436,48 @@ def list_commands(printer: CustomPrinter) -> None:
     table.add_column("Script Location", min_width=12)
 
     # Add all command information to the table
-    for index, cmd in enumerate(sorted(commands), start=1):
-        wrapper_path = os.path.join(constants.WRAPPER_SCRIPTS_FOLDER, cmd)
-        # Read the script to get the target path
-        with open(wrapper_path, 'r') as f:
-            content = f.read()
-            # Extract the script path from the wrapper
-            script_path = content.split('script_path = "')[1].split('"')[0]
+    for index, (cmd, script_path) in enumerate(sorted(commands.items(), key=lambda item: item[0].lower()), start=1):
         table.add_row(str(index), cmd, script_path)
     printer.print(table)
 
 
-def install(args: argparse.Namespace) -> None:
-    printer = CustomPrinter(args.debug)
-
-    # Create necessary directories
+def send_file(src_fd: int, dst_fd: int, offset: int = 0) -> None:
+    """Copy src_fd from offset to its end into dst_fd in-kernel with os.sendfile"""
+    size = os.fstat(src_fd).st_size
+    try:
+        while offset < size:
+            sent = os.sendfile(dst_fd, src_fd, offset, size - offset)
+            if sent == 0:
+                break
+            offset += sent
+    except OSError:
+        # Some platforms (e.g. macOS) only support sendfile to sockets
+        os.lseek(src_fd, offset, os.SEEK_SET)
+        while chunk := os.read(src_fd, 64 * 1024):
+            os.write(dst_fd, chunk)
+
+
+def copy_file(src: str, dst: str) -> None:
+    """Copy a file with send_file, preserving mode and timestamps like shutil.copy2"""
+    # Stream into a temp file beside dst and swap it in, so dst is never truncated
+    # before src is read (they may be the same file when re-installing from the install dir)
+    with open(src, 'rb') as source, \
+            tempfile.NamedTemporaryFile(dir=os.path.dirname(dst), prefix='.', delete=False) as dest:
+        try:
+            st = os.fstat(source.fileno())
+            send_file(source.fileno(), dest.fileno())
+            os.fchmod(dest.fileno(), stat.S_IMODE(st.st_mode))
+            os.utime(dest.fileno(), ns=(st.st_atime_ns, st.st_mtime_ns))
+        except BaseException:
+            os.remove(dest.name)
+            raise
+    os.replace(dest.name, dst)
+
+
+def install(args: argparse.Namespace, printer: CustomPrinter) -> None:
+    # Create necessary directories (the wrapper scripts folder lives inside INSTALL_DIR)
     os.makedirs(constants.WRAPPER_SCRIPTS_FOLDER, exist_ok=True)
-    os.makedirs(os.path.dirname(constants.INSTALL_LINK), exist_ok=True)
+    os.makedirs(constants.USER_BIN_DIR, exist_ok=True)
 
     printer.info("Creating directories...")
     printer.success("Created necessary directories.")
@@ -272,25 +486,27 @@ def install(args: argparse.Namespace) -> None:
     current_script = os.path.abspath(__file__)
 
     try:
-        # Create installation directory if it doesn't exist
-        os.makedirs(constants.INSTALL_DIR, exist_ok=True)
-
-        # Create the executable script with shebang
+        # Create the executable script, adding a shebang only if the source lacks one.
+        # It is streamed into a temp file and swapped in, since the running script may be
+        # the installed one (e.g. 'bake -i' through the symlink) and must not be truncated first.
         printer.info("Creating executable script...")
-        with open(current_script, 'r') as source:
-            script_content = source.read()
-
-        with open(constants.INSTALL_SCRIPT, 'w') as dest:
-            dest.write('#!/usr/bin/env python3\n')
-            dest.write(script_content)
-
-        # Make the script executable
-        os.chmod(constants.INSTALL_SCRIPT, 0o755)
+        with open(current_script, 'rb') as source, \
+                tempfile.NamedTemporaryFile(dir=constants.INSTALL_DIR, prefix='.', delete=False) as dest:
+            try:
+                if os.pread(source.fileno(), 2, 0) != b'#!':
+                    os.write(dest.fileno(), b'#!/usr/bin/env python3\n')
+                send_file(source.fileno(), dest.fileno())
+
+                # Make the script executable
+                os.fchmod(dest.fileno(), 0o755)
+            except BaseException:
+                os.remove(dest.name)
+                raise
+        os.replace(dest.name, constants.INSTALL_SCRIPT)
 
         # Create symbolic link
-        if os.path.exists(constants.INSTALL_LINK):
-            printer.info("Removing existing symbolic link...")
-            os.remove(constants.INSTALL_LINK)
+        if remove_if_exists(constants.INSTALL_LINK):
+            printer.info("Removed existing symbolic link.")
 
         printer.info(f"Creating symbolic link at {constants.INSTALL_LINK}...")
         os.symlink(constants.INSTALL_SCRIPT, constants.INSTALL_LINK)
@@ -301,7 +517,7 @@ def install(args: argparse.Namespace) -> None:
             src = os.path.join(current_dir, file)
             dst = os.path.join(constants.INSTALL_DIR, file)
             if os.path.exists(src):
-                shutil.copy2(src, dst)
+                copy_file(src, dst)
                 printer.debug(f"Copied {file}")
 
         # Ensure bin directory is in PATH
@@ -314,12 +530,17 @@ def install(args: argparse.Namespace) -> None:
         sys.exit(1)
 
 
-def uninstall(args: argparse.Namespace) -> None:
-    printer = CustomPrinter(args.debug)
+def uninstall(args: argparse.Namespace, printer: CustomPrinter) -> None:
+    import shutil
+
     try:
         # Check if paths exist
         wrapper_scripts_exists = os.path.exists(constants.WRAPPER_SCRIPTS_FOLDER)
-        install_link_exists = os.path.exists(constants.INSTALL_LINK)
+        entries = []
+        if wrapper_scripts_exists:
+            with os.scandir(constants.WRAPPER_SCRIPTS_FOLDER) as it:
+                entries = [entry for entry in it
+                           if not entry.name.startswith(".") and entry.is_file(follow_symlinks=False)]
         install_dir_exists = os.path.exists(constants.INSTALL_DIR)
 
         # For hard uninstall, confirm unless force flag is used
@@ -329,31 +550,31 @@ def uninstall(args: argparse.Namespace) -> None:
 
             # List commands that will be deleted
             if wrapper_scripts_exists:
-                commands = os.listdir(constants.WRAPPER_SCRIPTS_FOLDER)
-                if commands:
-                    for cmd in commands:
-                        printer.print(f"  - {cmd}")
+                if entries:
+                    for entry in entries:
+                        printer.print(f"  - {entry.name}")
                 else:
                     printer.info("  No commands found.")
 
-            confirm = input("\nAre you sure you want to proceed? [y/N]: ").lower()
-            if confirm != 'y':
+            if not printer.confirm("Are you sure you want to proceed?"):
                 printer.info("Uninstall cancelled.")
                 return
 
         # Remove symbolic link if it exists
-        if install_link_exists:
-            printer.info("Removing symbolic link...")
-            os.remove(constants.INSTALL_LINK)
+        if remove_if_exists(constants.INSTALL_LINK):
+            printer.info("Removed symbolic link.")
 
         # If hard uninstall requested, remove all command symlinks
-        if args.hard and wrapper_scripts_exists:
+        if args.hard and wrapper_scripts_exists and os.path.isdir(constants.USER_BIN_DIR):
             printer.info("Removing all bake command aliases...")
-            for cmd in os.listdir(constants.WRAPPER_SCRIPTS_FOLDER):
-                symlink_path = os.path.join(constants.USER_BIN_DIR, cmd)
-                if os.path.exists(symlink_path):
-                    os.remove(symlink_path)
-                    printer.debug(f"Removed alias: {cmd}")
+            # Resolve the bin directory once and unlink each alias relative to it (unlinkat)
+            bin_fd = os.open(constants.USER_BIN_DIR, os.O_RDONLY | os.O_DIRECTORY)
+            try:
+                for entry in entries:
+                    if remove_if_exists(entry.name, dir_fd=bin_fd):
+                        printer.debug(f"Removed alias: {entry.name}")
+            finally:
+                os.close(bin_fd)
 
         # Remove installation directory if it exists
         if install_dir_exists:
@@ -372,32 +593,50 @@ def uninstall(args: argparse.Namespace) -> None:
         sys.exit(1)
 
 
+# Action handlers keyed by subcommand name
+ACTIONS = {
+    "add": add_command,
+    "edit": edit_command,
+    "delete": delete_command,
+    "rename": rename_command,
+    "list": list_commands,
+}
+
+
 def main() -> None:
-    parser = create_parser()
-    args = parser.parse_args()
+    # Answer a bare version query before building the parser or importing rich
+    if sys.argv[1:] in (["-v"], ["--version"]):
+        print(f"v{constants.VERSION}")
+        return
+
+    from printer import CustomPrinter
+
+    # Install/uninstall never use the action subparsers, so skip building them unless
+    # the minimal parser is left with arguments only the full parser understands.
+    # Help always comes from the full parser so it lists the actions as well.
+    args = None
+    argv = sys.argv[1:]
+    if (any(arg in ("-i", "--install", "--uninstall") for arg in argv)
+            and not any(arg in ("-h", "--help") for arg in argv)):
+        args, extra = create_install_parser().parse_known_args()
+        if extra:
+            args = None
+    if args is None:
+        args = create_parser().parse_args()
     printer = CustomPrinter(args.debug)
 
     if args.install:
-        return install(args)
+        return install(args, printer)
     elif args.uninstall:
-        return uninstall(args)
+        return uninstall(args, printer)
 
     if args.version:
-        return printer.info(f"v{constants.VERSION}")
+        return print(f"v{constants.VERSION}")
 
-    if args.action:
+    handler = ACTIONS.get(args.action)
+    if handler:
         try:
-            match args.action:
-                case "add":
-                    add_command(args, printer)
-                case "edit":
-                    edit_command(args, printer)
-                case "delete":
-                    delete_command(args, printer)
-                case "rename":
-                    rename_command(args, printer)
-                case "list":
-                    list_commands(printer)
+            handler(args, printer)
         except Exception as e:
             printer.error(f"Operation failed: {str(e)}")
             sys.exit(1)
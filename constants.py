@@ -1,3 +1,4 @@
+import functools
 import os
 
 # Get user's home directory
@@ -13,19 +14,25 @@ INSTALL_LINK = os.path.join(USER_BIN_DIR, "bake")
 # Wrapper scripts location
 WRAPPER_SCRIPTS_FOLDER = os.path.join(INSTALL_DIR, "scripts")
 
+# Directory prefixes for building per-command paths by concatenation
+WRAPPER_PREFIX = os.path.join(WRAPPER_SCRIPTS_FOLDER, "")
+BIN_PREFIX = os.path.join(USER_BIN_DIR, "")
+
+# Index of command name -> target script, kept in sync with the wrapper scripts
+COMMAND_INDEX = os.path.join(INSTALL_DIR, "commands.json")
+
 # Shell detection
 SHELL_NAME = os.environ.get("SHELL", "").split("/")[-1]
 
+# Shell config files, keyed by shell name
+SHELL_CONFIG_FILES = {
+    "bash": os.path.join(HOME, ".bashrc"),
+    "zsh": os.path.join(HOME, ".zshrc"),
+    "fish": os.path.join(HOME, ".config", "fish", "config.fish"),
+}
+
 
+@functools.lru_cache(maxsize=1)
 def get_shell_config_file():
     """Get the appropriate shell config file path"""
-    shell = SHELL_NAME.lower()
-    home = os.path.expanduser("~")
-
-    if shell == "bash":
-        return os.path.join(home, ".bashrc")
-    elif shell == "zsh":
-        return os.path.join(home, ".zshrc")
-    elif shell == "fish":
-        return os.path.join(home, ".config", "fish", "config.fish")
-    return None
+    return SHELL_CONFIG_FILES.get(SHELL_NAME.lower())
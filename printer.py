@@ -1,11 +1,39 @@
-from rich.console import Console
-from rich.text import Text
+from __future__ import annotations
 
+import sys
+from typing import TYPE_CHECKING
 
-class CustomPrinter(Console):
+if TYPE_CHECKING:
+    from rich.console import Console
+
+
+class CustomPrinter:
     def __init__(self, is_debug: bool = False):
-        super().__init__()
         self.is_debug = is_debug
+        self._console = None
+        # Piped or redirected output is unstyled anyway, so status lines skip rich entirely
+        self._plain = not sys.stdout.isatty()
+
+    @property
+    def console(self) -> Console:
+        """Rich console, imported and created on first use to keep rich off the startup path"""
+        if self._console is None:
+            from rich.console import Console
+            self._console = Console()
+        return self._console
+
+    def print(self, *objects, **kwargs) -> None:
+        """Print renderables through the rich console"""
+        self.console.print(*objects, **kwargs)
+
+    def input(self, prompt: str = "") -> str:
+        """Prompt for input through the rich console"""
+        # Prompts are plain text; markup parsing would swallow things like "[y/N]"
+        return self.console.input(prompt, markup=False)
+
+    def confirm(self, prompt: str) -> bool:
+        """Ask a yes/no question; anything but "y" or "yes" counts as no"""
+        return self.input(f"\n{prompt} [y/N]: ").strip().lower() in ("y", "yes")
 
     def success(self, message: str) -> None:
         """Print success messages with enhanced formatting"""
@@ -29,10 +57,14 @@ class CustomPrinter(Console):
             self._print_formatted("[⚙]", message, "magenta", "dim")
 
     def _print_formatted(self, symbol: str, message: str, color: str, *styles: iter) -> None:
-        text = Text()
-        text.append(f"{symbol} ", style=color)
-        text.append(message, style=" ".join([color] + list(styles)))
-        self.print(text)
+        if self._plain:
+            print(f"{symbol} {message}")
+            return
+
+        from rich.text import Text
+
+        # Build the Text in one call; message is kept literal so "[...]" in it is never parsed as markup
+        self.print(Text.assemble((f"{symbol} ", color), (message, " ".join((color,) + styles))))
 
 
 if __name__ == "__main__":